@@ -1,8 +1,8 @@
 import inspect
-from collections import defaultdict, deque
+from collections import deque
 from collections.abc import AsyncIterator
 from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
-from graphlib import TopologicalSorter
+from graphlib import CycleError
 from typing import Annotated, Any, Callable, ClassVar, Self, Union
 
 import msgspec
@@ -14,10 +14,25 @@ type Constructor = Union[type["Injectable"], WrappedProvider]
 
 
 class ExecutionContext(AsyncExitStack):
+    _pool: ClassVar[deque["ExecutionContext"]] = deque(maxlen=1024)
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.instances: dict[type, Any] = {}
 
+    @classmethod
+    def acquire(cls) -> "ExecutionContext":
+        "Return an empty context, reusing a released one when available."
+        try:
+            return cls._pool.pop()
+        except IndexError:
+            return cls()
+
+    def release(self) -> None:
+        "Return an exited context to the pool, it must not be used afterwards."
+        self.instances.clear()
+        self._pool.append(self)
+
     async def enter_async_context(self, cm: AbstractAsyncContextManager[Any]) -> Any:
         instance = await super().enter_async_context(cm)
         self.instances[instance.__class__] = instance
@@ -34,35 +49,49 @@ class ExecutionContext(AsyncExitStack):
 
 
 class Injectable(msgspec.Struct):
-    __dependencies__: ClassVar[dict[Constructor, list[Constructor]]] = defaultdict(list)
+    __dependencies__: ClassVar[dict[Constructor, tuple[Constructor, ...]]] = {}
+    __dependency_order__: ClassVar[dict[Constructor, tuple[Constructor, ...]]] = {}
+    __inject_fields__: ClassVar[tuple[tuple[str, type], ...]] = ()
 
     @classmethod
-    def _dependencies(cls):
+    def _dependencies(cls) -> tuple[Constructor, ...]:
         "Return the topologically sorted dependencies of the class."
-        graph: dict[Constructor, list[Constructor]] = {}
-        dependencies = deque(Injectable.__dependencies__[cls])
-        while dependencies:
-            dependency = dependencies.popleft()
-            if dependency in graph:
+        if (cached := Injectable.__dependency_order__.get(cls)) is not None:
+            return cached
+        # iterative depth-first walk, a node is emitted after all of its dependencies
+        graph = Injectable.__dependencies__
+        order: list[Constructor] = []
+        done: dict[Constructor, bool] = {}  # False while the node is on the current path
+        stack = [(dep, False) for dep in reversed(graph.get(cls, ()))]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                done[node] = True
+                order.append(node)
                 continue
-            graph[dependency] = Injectable.__dependencies__[dependency]
-            for dep in graph[dependency]:
-                if dep not in graph:
-                    dependencies.append(dep)
-        # topological sort the graph
-        # t: TopologicalSorter[Constructor] = TopologicalSorter(graph)
-        return TopologicalSorter(graph).static_order()
+            if node in done:
+                if not done[node]:
+                    raise CycleError("nodes are in a cycle", node)
+                continue
+            done[node] = False
+            stack.append((node, True))
+            stack.extend((dep, False) for dep in reversed(graph.get(node, ())))
+        cached = Injectable.__dependency_order__[cls] = tuple(order)
+        return cached
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         "Register the class as an injectable."
         super().__init_subclass__(**kwargs)
-        for _, annotation in cls.__annotations__.items():
+        Injectable.__dependency_order__.clear()
+        fields: list[tuple[str, type]] = []
+        for name, annotation in cls.__annotations__.items():
             if origin := getattr(annotation, "__origin__", None):
                 if origin is ClassVar:
                     continue
                 if origin is Inject:
-                    typ = annotation.__args__[0]
-                    Injectable.__dependencies__[cls].append(typ)
+                    fields.append((name, annotation.__args__[0]))
+        cls.__inject_fields__ = tuple(fields)
+        Injectable.__dependencies__[cls] = tuple(typ for _, typ in fields)
 
     @classmethod
     def register(cls, fn: Provider) -> None:
@@ -80,18 +109,23 @@ class Injectable(msgspec.Struct):
         # wrap the provider function in an async context manager
         fn_acm = asynccontextmanager(fn)
 
+        injections = tuple(parameters)
+
         @asynccontextmanager
         async def provider(ctx: ExecutionContext) -> AsyncIterator[Any]:
-            if return_type in ctx:
-                yield ctx[return_type]
+            instances = ctx.instances
+            if return_type in instances:
+                yield instances[return_type]
                 return
-            args = {name: ctx[typ] for name, typ in parameters}
+            args = {name: instances[typ] for name, typ in injections}
             async with fn_acm(**args) as result:
-                ctx[return_type] = result
+                instances[return_type] = result
                 yield result
 
-        Injectable.__dependencies__[return_type].append(provider)
-        Injectable.__dependencies__[provider] = dependencies
+        providers = Injectable.__dependencies__.get(return_type, ())
+        Injectable.__dependencies__[return_type] = (*providers, provider)
+        Injectable.__dependencies__[provider] = tuple(dependencies)
+        Injectable.__dependency_order__.clear()
 
     @classmethod
     async def instance(cls, ctx: ExecutionContext) -> Self:
@@ -101,6 +135,10 @@ class Injectable(msgspec.Struct):
         if cls in ctx:
             return ctx[cls]
 
+        if not Injectable.__dependencies__.get(cls):
+            # nothing to inject, skip resolving the dependency graph
+            return cls()
+
         for dependency in cls._dependencies():
             match dependency:
                 case type():
@@ -109,11 +147,6 @@ class Injectable(msgspec.Struct):
                 case _ as provider:
                     await ctx.enter_async_context(provider(ctx))
 
-        args = {}
-        for name, annotation in cls.__annotations__.items():
-            if origin := getattr(annotation, "__origin__", None):
-                if origin is Inject:
-                    typ = annotation.__args__[0]
-                    args[name] = ctx[typ]
+        instances = ctx.instances
         # instantiate the class
-        return cls(**args)
+        return cls(**{name: instances[typ] for name, typ in cls.__inject_fields__})
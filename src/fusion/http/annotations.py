@@ -1,12 +1,14 @@
+import collections.abc
 import enum
+import functools
 import inspect
+import operator
+import types
 import typing
 
 import msgspec
 
 from fusion.exceptions import ValidationError
-
-# from starlette.requests import Request
 from fusion.http.request import Request
 
 type QueryParam[T] = typing.Annotated[T, "queryparam"]
@@ -15,33 +17,239 @@ type PathParam[T] = typing.Annotated[T, "pathparam"]
 type Header[T] = typing.Annotated[T, "header"]
 type RequestBody[T] = typing.Annotated[T, "requestbody"]
 type Cookie[T] = typing.Annotated[T, "cookie"]
+type Decoder = typing.Callable[[Request], typing.Any]
+
+# the request attribute holding the values of each mapping annotation
+SOURCES: dict[typing.Any, str] = {
+    QueryParam: "nested_query_params",
+    PathParam: "path_params",
+    Header: "headers",
+    Cookie: "cookies",
+}
+
+
+class Parameter(typing.NamedTuple):
+    name: str
+    annotation: typing.Any
+    default: typing.Any
+
+
+def parameters(fn: typing.Callable[..., typing.Any]) -> list[Parameter]:
+    """
+    Return the positional parameters of a function.
+
+    Decorated functions are unwrapped through `__wrapped__` first. Plain functions are read
+    from `__code__`, `__defaults__` and `__annotations__` directly, which is much cheaper than
+    building an `inspect.Signature`, other callables fall back to `inspect.signature`. Missing
+    annotations and defaults are reported as `inspect.Parameter.empty`, the same as
+    `inspect.signature` does.
+
+    Args:
+        fn (Callable): The function to inspect.
+
+    Raises:
+        TypeError: If the function takes keyword-only or variadic parameters, which can't be
+            passed positionally.
+
+    Returns:
+        list[Parameter]: The name, annotation and default of each parameter.
+    """
+    fn = inspect.unwrap(fn)
+    code = getattr(fn, "__code__", None)
+    if not isinstance(code, types.CodeType):
+        return signature_parameters(fn)
+
+    if code.co_kwonlyargcount or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS):
+        raise TypeError(f"Only positional parameters are supported: {fn.__qualname__}")
+
+    names = code.co_varnames[: code.co_argcount]
+    defaults = fn.__defaults__ or ()
+    annotations = fn.__annotations__
+    empty = inspect.Parameter.empty
+    offset = len(names) - len(defaults)
+    return [
+        Parameter(
+            name,
+            annotations.get(name, empty),
+            defaults[i - offset] if i >= offset else empty,
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def signature_parameters(fn: typing.Callable[..., typing.Any]) -> list[Parameter]:
+    "Return the positional parameters of a callable without a plain `__code__`."
+    result: list[Parameter] = []
+    for param in inspect.signature(fn).parameters.values():
+        if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            raise TypeError(f"Only positional parameters are supported: {fn!r}")
+        result.append(Parameter(param.name, param.annotation, param.default))
+    return result
+
+
+@functools.cache
+def body_decoder(typ: typing.Any) -> msgspec.json.Decoder:
+    "Return a json decoder for the given type, built once and reused across requests."
+    return msgspec.json.Decoder(typ)
+
+
+@functools.cache
+def converter(typ: typing.Any) -> typing.Callable[[typing.Any], typing.Any]:
+    """
+    Return a function converting a raw request value into `typ`.
+
+    `str` values are passed through as they are, every other type goes through
+    `msgspec.convert` with the type bound up front. Converters are shared between all
+    parameters of the same type.
+
+    Args:
+        typ (Any): The target type.
+
+    Returns:
+        Callable[[Any], Any]: The conversion function.
+    """
+    convert = functools.partial(msgspec.convert, type=typ, strict=False)
+    if typ is str:
+        return lambda value: value if isinstance(value, str) else convert(value)
+    return convert
+
+
+def has_no_body(request: Request) -> bool:
+    """
+    Check whether a bodyless request method was sent without a body.
+
+    Only the headers are inspected, so nothing is received from the client. A request
+    without content-length and transfer-encoding headers is only known to be empty over
+    HTTP/1.x, HTTP/2 and later may still stream a body.
+
+    Args:
+        request (Request): The request.
 
+    Returns:
+        bool: True for GET, HEAD and DELETE requests with a zero content length, or HTTP/1.x
+            ones without any body headers.
+    """
+    scope = request.scope
+    if scope["method"] not in ("GET", "HEAD", "DELETE"):
+        return False
+    for key, value in scope["headers"]:
+        if key == b"content-length":
+            return value.strip() == b"0"
+        if key == b"transfer-encoding":
+            return False
+    return scope.get("http_version") in ("1.0", "1.1")
 
-async def decode(param: inspect.Parameter, request: Request) -> typing.Any:
+
+def defaults_from_empty(typ: typing.Any) -> bool:
+    """
+    Check whether an empty object is a meaningful value of a request body type.
+
+    For structs and mappings `{}` means "use the defaults", so a request without a body can
+    skip receiving it. Any other type would only fail to convert from an object the client
+    never sent.
+
+    Args:
+        typ (Any): The request body type.
+
+    Returns:
+        bool: True for `msgspec.Struct` subclasses and mapping types.
+    """
+    origin = typing.get_origin(typ) or typ
+    return isinstance(origin, type) and issubclass(
+        origin, (msgspec.Struct, collections.abc.Mapping)
+    )
+
+
+def decoder(param: Parameter) -> Decoder:
+    """
+    Build the function that decodes a handler parameter from the request.
+
+    All the work that only depends on the parameter annotation is done here, once per
+    handler, so the returned function only looks the value up and converts it. Only the
+    request body decoder is async, the others are plain functions so decoding them costs
+    no coroutine.
+
+    Args:
+        param (Parameter): The handler parameter.
+
+    Returns:
+        Decoder: A function taking the request and returning the decoded value.
+    """
     if param.annotation is Request:
-        return request
+
+        def decode_request(request: Request) -> typing.Any:
+            return request
+
+        return decode_request
 
     origin = param.annotation.__origin__
     typ = param.annotation.__args__[0]
     if origin is RequestBody:
-        return msgspec.json.decode(await request.body(), type=typ)
+        body = body_decoder(typ)
+
+        async def decode_body(request: Request) -> typing.Any:
+            return body.decode(await request.body())
+
+        if not defaults_from_empty(typ):
+            return decode_body
 
-    typ_is_primitive = typ in (str, int, float, bool) or issubclass(typ, enum.Enum)
-    if origin is QueryParam:
-        data = request.query_params if typ_is_primitive else request.nested_query_params
-    elif origin is PathParam:
-        data = request.path_params
-    elif origin is Header:
-        data = request.headers
-    else:
-        data = request.cookies
+        convert = converter(typ)
 
-    if param.name in data:
-        return msgspec.convert(data[param.name], typ, strict=False)
+        async def decode_body_or_defaults(request: Request) -> typing.Any:
+            if has_no_body(request):
+                return convert({})
+            return body.decode(await request.body())
+
+        return decode_body_or_defaults
+
+    return mapping_decoder(origin, typ, param.name, param.default)
+
+
+def headers_dict(request: Request) -> dict[str, str]:
+    "Return the request headers as a dict, repeated headers keep their first value."
+    return dict(reversed(request.headers.items()))
+
+
+def mapping_decoder(origin: typing.Any, typ: typing.Any, name: str, default: typing.Any) -> Decoder:
+    """
+    Build the decoder for a parameter read from one of the request mappings.
+
+    Args:
+        origin (Any): The parameter annotation, e.g. `QueryParam` or `Header`.
+        typ (Any): The type the value is converted into.
+        name (str): The parameter name, used as the key in the mapping.
+        default (Any): The parameter default.
+
+    Returns:
+        Decoder: A function taking the request and returning the decoded value.
+    """
+    typ_is_primitive = typ in (str, int, float, bool) or (
+        isinstance(typ, type) and issubclass(typ, enum.Enum)
+    )
+    source = "query_params" if origin is QueryParam and typ_is_primitive else SOURCES[origin]
+    get_data: typing.Callable[[Request], typing.Any] = operator.attrgetter(source)
+    convert = converter(typ)
 
     if typ_is_primitive:
-        if param.default:
-            return param.default
-        raise ValidationError(f"Missing required parameter: {param.name}")
 
-    return msgspec.convert(data, typ, strict=False)
+        def decode_primitive(request: Request) -> typing.Any:
+            data = get_data(request)
+            if name in data:
+                return convert(data[name])
+            if default is not inspect.Parameter.empty:
+                return default
+            raise ValidationError(f"Missing required parameter: {name}")
+
+        return decode_primitive
+
+    if origin is Header:
+        # msgspec converts a plain dict faster than the `Headers` mapping
+        get_data = headers_dict
+
+    def decode_struct(request: Request) -> typing.Any:
+        data = get_data(request)
+        if name in data:
+            return convert(data[name])
+        return convert(data)
+
+    return decode_struct
@@ -1,27 +1,70 @@
 import inspect
-import typing
 from typing import Any, Callable, ClassVar, Coroutine
 
 import msgspec
 from starlette.exceptions import HTTPException
 
 from fusion.di import Injectable
-
-# from starlette.requests import Request
-from fusion.http.annotations import (
-    Cookie,
-    Header,
-    PathParam,
-    QueryParam,
-    RequestBody,
-    decode,
-)
+from fusion.exceptions import ValidationError
+from fusion.http.annotations import SOURCES, Parameter, RequestBody, decoder, parameters
 from fusion.http.request import Request
-from fusion.http.response import Response
+from fusion.http.response import Response, encoder
+
+
+def compile_handler(
+    handler: Callable[..., Any], params: list[Parameter]
+) -> Callable[["Endpoint", Request], Coroutine[Any, Any, Response]]:
+    """
+    Generate a straight-line wrapper that decodes the handler params and calls the handler.
+
+    Args:
+        handler (Callable[..., Any]): The endpoint method to wrap.
+        params (list[Parameter]): The parameters to decode from the request.
+
+    Returns:
+        Callable: An async function taking the endpoint instance and the request.
+    """
+    namespace: dict[str, Any] = {
+        "handler": handler,
+        "Response": Response,
+        "ValidationErrors": (msgspec.ValidationError, ValidationError),
+    }
+    args = "".join(f", a{i}" for i in range(len(params)))
+    lines = ["async def wrapped(this, request):"]
+    if params:
+        lines.append("    try:")
+        for i, param in enumerate(params):
+            namespace[f"d{i}"] = decode = decoder(param)
+            call = f"d{i}(request)"
+            if inspect.iscoroutinefunction(decode):
+                call = f"await {call}"
+            lines.append(f"        a{i} = {call}")
+        lines += [
+            "    except ValidationErrors as e:",
+            "        return Response(str(e), status_code=400)",
+        ]
+    result = f"await handler(this{args})"
+    returns = getattr(inspect.unwrap(handler), "__annotations__", {}).get("return")
+    if isinstance(returns, type) and issubclass(returns, msgspec.Struct):
+        # the handler returns a struct, encode it without going through render, only the
+        # `None` check of render is kept
+        namespace["encode"] = encoder.encode
+        lines.append(f"    result = {result}")
+        result = 'b"" if result is None else encode(result)'
+    lines.append(f"    return Response({result})")
+    # the source is built from fixed identifiers only, the handler, decoders and request
+    # values are passed through the namespace and never end up in the code
+    # partials and callable instances have no `__qualname__`
+    name = getattr(handler, "__qualname__", repr(handler))
+    source = compile("\n".join(lines), f"<fusion:{name}>", "exec")
+    exec(source, namespace)  # nosec B102
+    return namespace["wrapped"]
 
 
 class Endpoint(Injectable):
-    _allowed_methods: ClassVar[list[str]] = []
+    _allowed_methods: ClassVar[tuple[str, ...]] = ()
+    _method_not_allowed_headers: ClassVar[dict[str, str]] = {"Allow": ""}
+    _handlers: ClassVar[dict[str, Callable[..., Any]]] = {}
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         super().__init_subclass__(**kwargs)
@@ -29,51 +72,40 @@ class Endpoint(Injectable):
         def wrap(
             handler: Callable[..., Any],
         ) -> Callable[[Endpoint, Request], Coroutine[Any, Any, Response]]:
-            signature = inspect.signature(handler)
-            params: list[inspect.Parameter] = []
-            for _, param in signature.parameters.items():
+            params: list[Parameter] = []
+            for param in parameters(handler):
                 if param.name == "self":
                     continue
                 if param.annotation is Request:
                     params.append(param)
                     continue
                 if origin := getattr(param.annotation, "__origin__", None):
-                    if origin in (QueryParam, PathParam, Header, RequestBody, Cookie):
+                    if origin is RequestBody or origin in SOURCES:
                         params.append(param)
                         continue
                 raise TypeError(f"Unsupported parameter type: {param.annotation}")
 
-            async def wrapped(this: Endpoint, request: Request) -> Response:
-                try:
-                    args: list[typing.Any] = [await decode(param, request) for param in params]
-                except msgspec.ValidationError as e:
-                    return Response(str(e), status_code=400)
-
-                return Response(await handler(this, *args))
-
-            return wrapped
+            return compile_handler(handler, params)
 
+        handlers: dict[str, Callable[..., Any]] = {}
         for method in ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"):
             if handler := getattr(cls, method.lower(), None):
-                setattr(cls, method.lower(), wrap(handler))
-                cls._allowed_methods.append(method)
+                handlers[method] = wrap(handler)
+                setattr(cls, method.lower(), handlers[method])
+        cls._allowed_methods = tuple(handlers)
+        cls._method_not_allowed_headers = {"Allow": ", ".join(cls._allowed_methods)}
+        if "GET" in handlers:
+            handlers.setdefault("HEAD", handlers["GET"])
+        cls._handlers = handlers
 
     async def method_not_allowed(self, request: Request) -> Response:
-        headers = {"Allow": ", ".join(self._allowed_methods)}
+        headers = self._method_not_allowed_headers
         if "app" in request.scope:
             raise HTTPException(status_code=405, headers=headers)
         return Response("Method Not Allowed", status_code=405, headers=headers)
 
     async def dispatch(self, request: Request) -> Response:
-        handler_name = (
-            "get"
-            if request.method == "HEAD" and not hasattr(self, "head")
-            else request.method.lower()
-        )
-
-        handler: Callable[..., Any] = getattr(self, handler_name, self.method_not_allowed)
-        # TODO: inject query params, path params, and body into handler
-        return await handler(request)
-        # result = await handler(request)
-        # # TODO: decode result into response
-        # return Response(result)
+        handler = self._handlers.get(request.method)
+        if handler is None:
+            return await self.method_not_allowed(request)
+        return await handler(self, request)
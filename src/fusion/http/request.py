@@ -2,6 +2,8 @@ import typing
 from urllib.parse import parse_qsl
 
 from starlette.requests import Request as StarletteRequest
+from starlette.requests import empty_receive, empty_send
+from starlette.types import Receive, Scope, Send
 
 from fusion.http.types import QueryParams
 
@@ -9,9 +11,24 @@ from fusion.http.types import QueryParams
 class Request(StarletteRequest):
     _nested_query_params: typing.Optional[QueryParams] = None
 
+    def __init__(self, scope: Scope, receive: Receive = empty_receive, send: Send = empty_send):
+        # same state as starlette's constructor without the chained __init__ calls and the
+        # scope type asserts, routes only ever build requests for http scopes
+        self.scope = scope
+        self._receive = receive
+        self._send = send
+        self._stream_consumed = False
+        self._is_disconnected = False
+        self._form = None
+
     @property
     def nested_query_params(self) -> QueryParams:
-        if not self._nested_query_params:
-            query_string = self.scope["query_string"].decode("utf8")
-            self._nested_query_params = QueryParams(parse_qsl(query_string))
+        if self._nested_query_params is None:
+            if self.scope["query_string"]:
+                # parsed on its own rather than from `query_params`, which decodes the raw
+                # query string as latin-1 and would garble raw utf-8 bytes
+                query_string = self.scope["query_string"].decode("utf8")
+                self._nested_query_params = QueryParams(parse_qsl(query_string))
+            else:
+                self._nested_query_params = QueryParams()
         return self._nested_query_params
@@ -3,6 +3,9 @@ from typing import Any
 import msgspec
 from starlette.responses import Response as StarletteResponse
 
+# one json encoder shared by every response and the generated endpoint wrappers
+encoder = msgspec.json.Encoder()
+
 
 class Response(StarletteResponse):
     """
@@ -28,4 +31,4 @@ class Response(StarletteResponse):
         if isinstance(content, str):
             return content.encode("utf-8")
 
-        return msgspec.json.encode(content)
+        return encoder.encode(content)
@@ -26,16 +26,62 @@ class Route(StarletteRoute):
             methods=methods,
             name=name,
             include_in_schema=include_in_schema,
-            middleware=middleware,
         )
 
-        async def wrapped(scope: Scope, receive: Receive, send: Send) -> None:
-            nonlocal endpoint
-            request = Request(scope, receive, send)
-            async with ExecutionContext() as ctx:
-                ctx[Request] = request
-                ep = await endpoint.instance(ctx)
-                response = await ep.dispatch(request)
+        # the wrappers bind what they use as keyword defaults, so the per-request path
+        # reads fast locals instead of closure cells and globals
+        async def wrapped(
+            scope: Scope,
+            receive: Receive,
+            send: Send,
+            *,
+            _Request: type[Request] = Request,
+            _acquire: typing.Callable[[], ExecutionContext] = ExecutionContext.acquire,
+            _instance: typing.Callable[..., typing.Any] = endpoint.instance,
+        ) -> None:
+            request = _Request(scope, receive, send)
+            ctx = _acquire()
+            try:
+                async with ctx:
+                    ctx.instances[_Request] = request
+                    ep = await _instance(ctx)
+                    response = await ep.dispatch(request)
+                    await response(scope, receive, send)
+            finally:
+                ctx.release()
+
+        async def wrapped_without_context(
+            scope: Scope,
+            receive: Receive,
+            send: Send,
+            *,
+            _Request: type[Request] = Request,
+            _endpoint: type[Endpoint] = endpoint,
+        ) -> None:
+            response = await _endpoint().dispatch(_Request(scope, receive, send))
+            await response(scope, receive, send)
+
+        # endpoints without injected fields don't need an execution context
+        if endpoint.__inject_fields__:
+            app = wrapped
+        elif endpoint.__struct_fields__:
+            app = wrapped_without_context
+        else:
+            # an endpoint without any field holds no state, one instance serves every request
+            async def wrapped_stateless(
+                scope: Scope,
+                receive: Receive,
+                send: Send,
+                *,
+                _Request: type[Request] = Request,
+                _dispatch: typing.Callable[..., typing.Any] = endpoint().dispatch,
+            ) -> None:
+                response = await _dispatch(_Request(scope, receive, send))
                 await response(scope, receive, send)
 
-        self.app = wrapped
+            app = wrapped_stateless
+
+        # build the middleware chain around the endpoint once
+        self.app = app
+        for cls, options in reversed(middleware or ()):
+            self.app = cls(app=self.app, **options)
@@ -1,24 +1,40 @@
+import re
 import typing
 
+# keys without any of these characters are stored as they are
+_NESTED_KEY = re.compile(r"[.\[]")
+
 
 class QueryParams(dict[str, typing.Any]):
-    def __init__(self, mapping: list[tuple[str, str]] = []):
+    def __init__(self, mapping: typing.Iterable[tuple[str, str]] = ()):
+        pairs = list(mapping)
+        if all(_NESTED_KEY.search(key) is None for key, _ in pairs):
+            # flat keys only, nothing to nest
+            super().__init__(pairs)
+            return
         super().__init__()
-        for key, value in mapping:
+        for key, value in pairs:
             self.__setitem__(key, value)
 
     def __setitem__(self, key: str, value: typing.Any) -> None:
-        k, *rest = key.split(".", maxsplit=1)
-        if rest:
-            rest = rest[0]
-            if k not in self:
-                self[k] = QueryParams()
-            self[k][rest] = value
+        if _NESTED_KEY.search(key) is None:
+            dict.__setitem__(self, key, value)
+            return
+
+        # walk down the dotted key, creating the intermediate nodes as needed
+        node: dict[str, typing.Any] = self
+        i = key.find(".")
+        while i != -1:
+            k = key[:i]
+            sub = node.get(k)
+            if sub is None:
+                sub = QueryParams()
+                dict.__setitem__(node, k, sub)
+            node = sub
+            key = key[i + 1 :]
+            i = key.find(".")
+
+        if key.endswith("[]"):
+            dict.setdefault(node, key[:-2], []).append(value)
         else:
-            if key.endswith("[]"):
-                key = key[:-2]
-                if key not in self:
-                    self[key] = []
-                self[key].append(value)
-            else:
-                super().__setitem__(key, value)
+            dict.__setitem__(node, key, value)
@@ -0,0 +1,236 @@
+import functools
+import inspect
+
+import msgspec
+import pytest
+from starlette.testclient import TestClient
+
+from fusion import Application, Endpoint, Header, QueryParam, Request, RequestBody, Route
+from fusion.exceptions import ValidationError
+from fusion.http.annotations import (
+    Parameter,
+    decoder,
+    defaults_from_empty,
+    has_no_body,
+    parameters,
+)
+
+empty = inspect.Parameter.empty
+
+
+def decorated(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+async def handler(self, name: QueryParam[str], n: QueryParam[int] = 3):
+    pass  # pragma: no cover
+
+
+def test_parameters():
+    assert parameters(handler) == [
+        Parameter("self", empty, empty),
+        Parameter("name", QueryParam[str], empty),
+        Parameter("n", QueryParam[int], 3),
+    ]
+
+
+def test_parameters_of_decorated_function():
+    assert parameters(decorated(handler)) == parameters(handler)
+
+
+def test_parameters_of_callable_without_code():
+    assert parameters(functools.partial(handler, None)) == [
+        Parameter("name", QueryParam[str], empty),
+        Parameter("n", QueryParam[int], 3),
+    ]
+
+
+async def keyword_only(self, *, name: QueryParam[str]):
+    pass  # pragma: no cover
+
+
+async def var_positional(self, *names: QueryParam[str]):
+    pass  # pragma: no cover
+
+
+async def var_keyword(self, **names: QueryParam[str]):
+    pass  # pragma: no cover
+
+
+@pytest.mark.parametrize("fn", [keyword_only, var_positional, var_keyword])
+def test_parameters_rejects_non_positional(fn):
+    with pytest.raises(TypeError, match="Only positional parameters are supported"):
+        parameters(fn)
+
+
+def test_parameters_of_callable_without_code_rejects_non_positional():
+    with pytest.raises(TypeError, match="Only positional parameters are supported"):
+        parameters(functools.partial(keyword_only, None))
+
+
+class Auth(msgspec.Struct):
+    token: str
+    locale: str = "en"
+
+
+class Headers(Endpoint):
+    async def get(self, auth: Header[Auth], token: Header[str]) -> dict:
+        return {"auth": auth, "token": token}
+
+
+def test_header_struct():
+    client = TestClient(Application(routes=[Route("/", Headers)]))
+    response = client.get("/", headers=[("token", "first"), ("token", "second")])
+    assert response.status_code == 200
+    # repeated headers keep their first value, like `Headers.__getitem__`
+    assert response.json() == {"auth": {"token": "first", "locale": "en"}, "token": "first"}
+    assert client.get("/", headers={"token": "t", "locale": "tr"}).json()["auth"] == {
+        "token": "t",
+        "locale": "tr",
+    }
+
+
+def test_header_struct_missing_field():
+    client = TestClient(Application(routes=[Route("/", Headers)]))
+    assert client.get("/", headers={"locale": "tr"}).status_code == 400
+
+
+class Query(msgspec.Struct):
+    q: str = ""
+    page: int = 1
+
+
+class Required(msgspec.Struct):
+    q: str
+
+
+class Search(Endpoint):
+    async def get(self, query: RequestBody[Query]) -> Query:
+        return query
+
+    async def delete(self, query: RequestBody[Required]) -> Required:
+        return query
+
+
+def test_bodyless_request_uses_struct_defaults():
+    client = TestClient(Application(routes=[Route("/", Search)]))
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json() == {"q": "", "page": 1}
+    assert client.delete("/").status_code == 400
+
+
+def test_bodyless_method_with_a_body_is_decoded():
+    client = TestClient(Application(routes=[Route("/", Search)]))
+    response = client.request("DELETE", "/", json={"q": "x"})
+    assert response.status_code == 200
+    assert response.json() == {"q": "x"}
+
+
+def body_request(
+    method: str,
+    http_version: str,
+    headers: list[tuple[bytes, bytes]],
+    body: bytes = b'{"q": "x"}',
+) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {"type": "http", "method": method, "http_version": http_version, "headers": headers}
+    return Request(scope, receive)
+
+
+@pytest.mark.parametrize(
+    "method, http_version, headers, expected",
+    [
+        ("POST", "1.1", [], False),
+        ("DELETE", "1.1", [], True),
+        ("DELETE", "1.0", [], True),
+        ("DELETE", "2", [], False),
+        ("DELETE", "2", [(b"content-length", b"0")], True),
+        ("DELETE", "1.1", [(b"content-length", b"10")], False),
+        ("GET", "1.1", [(b"transfer-encoding", b"chunked")], False),
+    ],
+)
+def test_has_no_body(method, http_version, headers, expected):
+    assert has_no_body(body_request(method, http_version, headers)) is expected
+
+
+@pytest.mark.asyncio
+async def test_http2_body_without_content_length_is_decoded():
+    decode = decoder(Parameter("query", RequestBody[Required], empty))
+    assert await decode(body_request("DELETE", "2", [])) == Required("x")
+
+
+@pytest.mark.parametrize(
+    "typ, expected",
+    [
+        (Query, True),
+        (dict, True),
+        (dict[str, int], True),
+        (list[int], False),
+        (int, False),
+        (Query | None, False),
+    ],
+)
+def test_defaults_from_empty(typ, expected):
+    assert defaults_from_empty(typ) is expected
+
+
+@pytest.mark.asyncio
+async def test_bodyless_mapping_is_empty():
+    decode = decoder(Parameter("data", RequestBody[dict[str, int]], empty))
+    assert await decode(body_request("GET", "1.1", [], b"")) == {}
+
+
+@pytest.mark.asyncio
+async def test_bodyless_shortcut_is_skipped_for_other_types():
+    decode = decoder(Parameter("ids", RequestBody[list[int]], empty))
+    # `{}` is no list, so the body is decoded as sent instead
+    assert await decode(body_request("GET", "1.1", [], b"[1, 2]")) == [1, 2]
+
+
+def query_request(query_string: bytes) -> Request:
+    return Request({"type": "http", "query_string": query_string, "headers": []})
+
+
+def test_primitive_parameter():
+    decode = decoder(Parameter("n", QueryParam[int], 3))
+    assert decode(query_request(b"n=5")) == 5
+    assert decode(query_request(b"")) == 3
+
+
+def test_missing_primitive_parameter():
+    decode = decoder(Parameter("n", QueryParam[int], empty))
+    with pytest.raises(ValidationError, match="Missing required parameter: n"):
+        decode(query_request(b"m=5"))
+
+
+def test_struct_parameter_by_name():
+    decode = decoder(Parameter("query", QueryParam[Query], empty))
+    assert decode(query_request(b"query.q=x&query.page=2&q=y")) == Query("x", 2)
+
+
+def test_struct_parameter_from_all_params():
+    decode = decoder(Parameter("query", QueryParam[Query], empty))
+    assert decode(query_request(b"q=y")) == Query("y")
+
+
+def test_falsy_default_is_used():
+    decode = decoder(Parameter("n", QueryParam[int], 0))
+    assert decode(query_request(b"")) == 0
+
+
+class RequiredName(Endpoint):
+    async def get(self, name: QueryParam[str]) -> str:
+        return name  # pragma: no cover
+
+
+def test_missing_primitive_parameter_returns_400():
+    response = TestClient(Application(routes=[Route("/", RequiredName)])).get("/")
+    assert response.status_code == 400
+    assert response.text == "Missing required parameter: name"
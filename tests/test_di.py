@@ -0,0 +1,158 @@
+from collections.abc import AsyncIterator
+from graphlib import CycleError
+
+import msgspec
+import pytest
+
+from fusion import ExecutionContext, Inject, Injectable
+
+
+class Settings(Injectable):
+    name: str = "fusion"
+
+
+def test_injectables_compare_by_value():
+    assert Settings() == Settings()
+    assert Settings() != Settings("other")
+
+
+class Left(msgspec.Struct):
+    pass
+
+
+class Right(msgspec.Struct):
+    pass
+
+
+async def left_provider(right: Inject[Right]) -> AsyncIterator[Left]:
+    yield Left()  # pragma: no cover
+
+
+async def right_provider(left: Inject[Left]) -> AsyncIterator[Right]:
+    yield Right()  # pragma: no cover
+
+
+Injectable.register(left_provider)
+Injectable.register(right_provider)
+
+
+class Cyclic(Injectable):
+    left: Inject[Left]
+
+
+def test_cyclic_dependencies_are_rejected():
+    with pytest.raises(CycleError):
+        Cyclic._dependencies()
+
+
+class Config(msgspec.Struct):
+    value: str
+
+
+calls: list[str] = []
+
+
+async def config_provider() -> AsyncIterator[Config]:
+    calls.append("enter")
+    yield Config("cfg")
+    calls.append("exit")
+
+
+Injectable.register(config_provider)
+
+
+class Repository(Injectable):
+    config: Inject[Config]
+
+
+class Cache(Injectable):
+    config: Inject[Config]
+
+
+class Service(Injectable):
+    repository: Inject[Repository]
+    cache: Inject[Cache]
+
+
+def test_dependencies_come_before_their_dependents():
+    order = [dep for dep in Service._dependencies() if isinstance(dep, type)]
+    assert order == [Config, Repository, Cache]
+    assert Service._dependencies() is Service._dependencies()
+
+
+@pytest.mark.asyncio
+async def test_shared_dependencies_are_provided_once():
+    calls.clear()
+    async with ExecutionContext() as ctx:
+        service = await Service.instance(ctx)
+        assert service.repository.config is service.cache.config
+        assert calls == ["enter"]
+    assert calls == ["enter", "exit"]
+
+
+@pytest.mark.asyncio
+async def test_released_contexts_are_reused_empty():
+    calls.clear()
+    ctx = ExecutionContext.acquire()
+    async with ctx:
+        await Service.instance(ctx)
+    ctx.release()
+
+    reused = ExecutionContext.acquire()
+    assert reused is ctx
+    assert reused.instances == {}
+    async with reused:
+        await Service.instance(reused)
+    reused.release()
+    # each use enters and exits the provider once, nothing is left over from the first one
+    assert calls == ["enter", "exit", "enter", "exit"]
+
+
+def test_acquire_creates_a_context_when_the_pool_is_empty():
+    ExecutionContext._pool.clear()
+    assert isinstance(ExecutionContext.acquire(), ExecutionContext)
+
+
+@pytest.mark.asyncio
+async def test_injectable_without_dependencies():
+    async with ExecutionContext() as ctx:
+        settings = await Settings.instance(ctx)
+        assert settings == Settings()
+        # the fast path doesn't touch the context
+        assert ctx.instances == {}
+        ctx[Settings] = settings
+        assert await Settings.instance(ctx) is settings
+
+
+class Tagged(Injectable):
+    settings: Inject[Settings]
+    tags: list[str] = []
+
+
+def test_only_inject_fields_are_dependencies():
+    assert Tagged.__inject_fields__ == (("settings", Settings),)
+    assert Injectable.__dependencies__[Tagged] == (Settings,)
+
+
+class Greeting(msgspec.Struct):
+    text: str
+
+
+async def greeting_provider(
+    settings: Inject[Settings], punctuation: str = "!"
+) -> AsyncIterator[Greeting]:
+    yield Greeting(f"hello {settings.name}{punctuation}")
+
+
+Injectable.register(greeting_provider)
+
+
+class Greeter(Injectable):
+    greeting: Inject[Greeting]
+
+
+@pytest.mark.asyncio
+async def test_provider_parameters_without_inject_keep_their_default():
+    async with ExecutionContext() as ctx:
+        greeter = await Greeter.instance(ctx)
+    assert greeter.greeting == Greeting("hello fusion!")
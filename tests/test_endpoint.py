@@ -0,0 +1,170 @@
+import functools
+
+import msgspec
+import pytest
+from starlette.testclient import TestClient
+
+from fusion import Application, Endpoint, QueryParam, Request, RequestBody, Route
+from fusion.http.endpoint import compile_handler
+
+
+def decorated(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+class Decorated(Endpoint):
+    @decorated
+    async def get(self, name: QueryParam[str]) -> str:
+        return name
+
+
+def client(*routes: Route) -> TestClient:
+    return TestClient(Application(routes=list(routes)))
+
+
+def test_decorated_handler():
+    response = client(Route("/dec", Decorated)).get("/dec?name=q")
+    assert response.status_code == 200
+    assert response.text == "q"
+
+
+def test_keyword_only_handler_is_rejected():
+    with pytest.raises(TypeError, match="Only positional parameters are supported"):
+
+        class KeywordOnly(Endpoint):
+            async def get(self, *, name: QueryParam[str]) -> str:
+                return name  # pragma: no cover
+
+
+class Person(msgspec.Struct):
+    name: str
+    age: int = 0
+
+
+class People(Endpoint):
+    async def get(self, name: QueryParam[str], age: QueryParam[int] = 1) -> Person:
+        return Person(name, age)
+
+    async def post(self, request: Request, person: RequestBody[Person]) -> dict:
+        return {"method": request.method, "person": person}
+
+
+def test_sync_decoders_are_called_without_await():
+    response = client(Route("/people", People)).get("/people?name=al&age=2")
+    assert response.status_code == 200
+    assert response.json() == {"name": "al", "age": 2}
+
+
+def test_async_decoders_are_awaited():
+    response = client(Route("/people", People)).post("/people", json={"name": "al"})
+    assert response.status_code == 200
+    assert response.json() == {"method": "POST", "person": {"name": "al", "age": 0}}
+
+
+@pytest.mark.parametrize(
+    "method, url, body",
+    [("GET", "/people?name=al&age=x", None), ("POST", "/people", {"age": 1})],
+)
+def test_invalid_parameters_return_400(method, url, body):
+    response = client(Route("/people", People)).request(method, url, json=body)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_compile_handler_without_parameters():
+    async def handler(self) -> str:
+        return "ok"
+
+    wrapped = compile_handler(handler, [])
+    response = await wrapped(None, Request({"type": "http"}))
+    assert response.body == b"ok"
+
+
+class ReadOnly(Endpoint):
+    async def get(self) -> str:
+        return "read"  # pragma: no cover
+
+
+class WriteOnly(Endpoint):
+    async def post(self) -> str:
+        return "write"  # pragma: no cover
+
+    async def delete(self) -> str:
+        return "gone"  # pragma: no cover
+
+
+def test_allow_header_lists_the_endpoint_methods_only():
+    app = client(Route("/read", ReadOnly), Route("/write", WriteOnly))
+    response = app.put("/read")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "GET"
+    assert app.put("/write").headers["allow"] == "POST, DELETE"
+
+
+@pytest.mark.asyncio
+async def test_method_not_allowed_outside_an_application():
+    request = Request({"type": "http", "method": "PUT"})
+    response = await WriteOnly().dispatch(request)
+    assert response.status_code == 405
+    assert response.headers["allow"] == "POST, DELETE"
+
+
+class Missing(Endpoint):
+    async def get(self) -> Person:
+        return None  # type: ignore
+
+
+def test_struct_handler_returning_none_sends_an_empty_body():
+    response = client(Route("/missing", Missing)).get("/missing")
+    assert response.status_code == 200
+    assert response.content == b""
+
+
+async def greet(self, name: QueryParam[str]) -> Person:
+    return Person(name)
+
+
+class Partial(Endpoint):
+    get = functools.partial(greet)
+
+
+class DecoratedStruct(Endpoint):
+    get = decorated(greet)
+
+
+@pytest.mark.parametrize("endpoint", [Partial, DecoratedStruct])
+def test_handlers_that_are_not_plain_functions(endpoint):
+    response = client(Route("/", endpoint)).get("/?name=x")
+    assert response.status_code == 200
+    assert response.json() == {"name": "x", "age": 0}
+
+
+def test_unsupported_parameter_is_rejected():
+    with pytest.raises(TypeError, match="Unsupported parameter type"):
+
+        class Unsupported(Endpoint):
+            async def get(self, name: str) -> str:
+                return name  # pragma: no cover
+
+
+def test_unsupported_generic_parameter_is_rejected():
+    with pytest.raises(TypeError, match="Unsupported parameter type"):
+
+        class UnsupportedGeneric(Endpoint):
+            async def get(self, names: list[str]) -> str:
+                return ""  # pragma: no cover
+
+
+class Nothing(Endpoint):
+    async def get(self):
+        return None
+
+
+def test_handler_without_struct_annotation_returning_none():
+    response = client(Route("/nothing", Nothing)).get("/nothing")
+    assert response.status_code == 200
+    assert response.content == b""
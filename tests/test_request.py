@@ -0,0 +1,23 @@
+from fusion import Request
+
+
+def request(query_string: bytes) -> Request:
+    return Request({"type": "http", "query_string": query_string, "headers": []})
+
+
+def test_nested_query_params():
+    params = request(b"p.name=bob&p.tags[]=a&p.tags[]=b&q=&n=1").nested_query_params
+    assert params == {"p": {"name": "bob", "tags": ["a", "b"]}, "n": "1"}
+
+
+def test_nested_query_params_decodes_utf8():
+    assert request(b"p.name=\xc3\xa9&q=%C3%A9").nested_query_params == {
+        "p": {"name": "é"},
+        "q": "é",
+    }
+
+
+def test_nested_query_params_empty():
+    req = request(b"")
+    assert req.nested_query_params == {}
+    assert req.nested_query_params is req.nested_query_params
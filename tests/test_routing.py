@@ -0,0 +1,90 @@
+from collections.abc import AsyncIterator
+
+import msgspec
+import pytest
+from starlette.middleware import Middleware
+from starlette.testclient import TestClient
+
+from fusion import Application, Endpoint, ExecutionContext, Inject, Injectable, Route
+
+
+class Counter(msgspec.Struct):
+    value: int
+
+
+counter = Counter(0)
+
+
+async def counter_provider() -> AsyncIterator[Counter]:
+    counter.value += 1
+    yield counter
+
+
+Injectable.register(counter_provider)
+
+
+class Counted(Endpoint):
+    counter: Inject[Counter]
+
+    async def get(self) -> dict:
+        return {"count": self.counter.value}
+
+
+def test_pooled_contexts_are_reused_across_requests():
+    ExecutionContext._pool.clear()
+    counter.value = 0
+    client = TestClient(Application(routes=[Route("/counted", Counted)]))
+    assert client.get("/counted").json() == {"count": 1}
+    assert len(ExecutionContext._pool) == 1
+    ctx = ExecutionContext._pool[0]
+    # the provider runs again for the second request, the pooled context kept nothing
+    assert client.get("/counted").json() == {"count": 2}
+    assert list(ExecutionContext._pool) == [ctx]
+    assert ctx.instances == {}
+
+
+class Tag:
+    def __init__(self, app, name: str) -> None:
+        self.app = app
+        self.name = name
+
+    async def __call__(self, scope, receive, send) -> None:
+        async def send_tagged(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message["headers"], (b"x-tag", self.name.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_tagged)
+
+
+class WithFields(Endpoint):
+    name: str = "fields"
+
+    async def get(self) -> str:
+        return self.name
+
+
+class Stateless(Endpoint):
+    async def get(self) -> str:
+        return "stateless"
+
+
+@pytest.mark.parametrize("endpoint", [Counted, WithFields, Stateless])
+def test_route_middleware_is_applied(endpoint):
+    route = Route(
+        "/", endpoint, middleware=[Middleware(Tag, name="outer"), Middleware(Tag, name="inner")]
+    )
+    response = TestClient(Application(routes=[route])).get("/")
+    assert response.status_code == 200
+    # the first middleware wraps the others, so it adds its header last
+    assert response.headers.get_list("x-tag") == ["inner", "outer"]
+
+
+class MyMiddleware(Tag):
+    pass
+
+
+def test_route_app_is_wrapped_in_middleware():
+    route = Route("/", Stateless, middleware=[Middleware(MyMiddleware, name="mine")])
+    assert isinstance(route.app, MyMiddleware)
+    assert route.app.name == "mine"